@@ -1,68 +1,144 @@
 """AWS Lambda handler for DCe cancellation events."""
 from __future__ import annotations
 
-import json
 import logging
-import uuid
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict
+from typing import Any, Dict, List, Set, Tuple
 
-from boto3.dynamodb.conditions import Attr, Key
-from botocore.exceptions import BotoCoreError, ClientError
+from botocore.exceptions import BotoCoreError, ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
 
-from adapters.clients import dynamodb_client, dynamodb_resource, sqs_client
+from adapters.clients import dynamodb_client, sqs_client
+from adapters.messages import SQS_BATCH_SIZE, correlation_attributes
+from adapters.serialization import json_dumps, json_loads
 from config.config import EnvConfig
-from domain.services.validation import validate_payload
-from exceptions import AuthorizationError, ValidationError
+from domain.services.validation import check_payload
+from exceptions import AuthorizationError
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
 EVENT_CODE = "110111"
 
+# Attribute values that are identical on every LATEST status item; botocore only
+# reads them during serialization, so the same objects are shared across writes.
+_LATEST_SORT_KEY = {"S": "LATEST"}
+_STATUS_VALUE = {"S": "CANCELLATION_REQUESTED"}
+_EVENT_CODE_VALUE = {"S": EVENT_CODE}
+_OPERATION_STATUS_VALUE = {"S": "RECEIVED"}
+
+# UpdateItem only touches these attributes, so anything else stored on LATEST by
+# other writers (downstream status or result fields) is preserved.
+_STATUS_UPDATE_EXPRESSION = (
+    "SET #status = :status, correlationId = :correlationId, "
+    "eventCode = :eventCode, updatedAt = :updatedAt, eventTimestamp = :eventTimestamp, "
+    "requestedAt = :requestedAt, cancellationReason = :reason, operationStatus = :operationStatus, "
+    "clientId = :clientId"
+)
+# With ENQUEUE_VIA_STREAM the SQS message body is also stored on the item and
+# published by ``stream_forwarder`` from the table's DynamoDB Stream.
+_STATUS_WITH_MESSAGE_UPDATE_EXPRESSION = _STATUS_UPDATE_EXPRESSION + ", messageBody = :messageBody"
+_STATUS_ATTRIBUTE_NAMES = {"#status": "status"}
+# Applied when the SQS send fails after the status write already landed; the
+# condition keeps it from touching a newer request's LATEST snapshot.
+_ENQUEUE_FAILED_UPDATE_EXPRESSION = "SET operationStatus = :operationStatus, updatedAt = :updatedAt"
+_ENQUEUE_FAILED_CONDITION = "correlationId = :correlationId"
+_ENQUEUE_FAILED_VALUE = {"S": "ENQUEUE_FAILED"}
+
+_AUTHORIZATION_KEY_CONDITION = "accessKey = :accessKey"
+_AUTHORIZATION_FILTER = "clientId = :clientId"
+
+# Probed in priority order against the lower-cased header view.
+_CLIENT_ID_HEADERS = ("client-id", "client_id", "clientid", "x-client-id")
+
+_SQS_EVENT_SOURCE = "aws:sqs"
+DYNAMODB_BATCH_SIZE = 25
+_BATCH_MAX_ATTEMPTS = 5
+_BATCH_BASE_DELAY_SECONDS = 0.05
+# Batch calls are only retried for throttling, 5xx and transport errors; anything
+# else (validation, permissions, missing queue or table) fails the same way again.
+_THROTTLING_ERROR_CODES = frozenset(
+    {
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "RequestLimitExceeded",
+        "TooManyRequestsException",
+        "ProvisionedThroughputExceededException",
+    }
+)
+
+# The SQS send and the DynamoDB upsert are independent round-trips; running them
+# side by side bounds the handler latency by the slower call instead of the sum.
+# Batches also fan their authorization lookups out here, up to the client pool size.
+_EXECUTOR = ThreadPoolExecutor(max_workers=10)
+
 
 def _parse_event(event: Dict[str, Any]) -> Dict[str, Any]:
-    if isinstance(event, dict) and "body" in event:
-        body = event.get("body")
-        if isinstance(body, str):
-            return json.loads(body or "{}")
-        if isinstance(body, dict):
-            return body
-    return event if isinstance(event, dict) else {}
+    if not isinstance(event, dict):
+        return {}
+    body = event.get("body")
+    if body is None:
+        # Direct invocations (tests, Step Functions) carry the payload as the event.
+        return event
+    if isinstance(body, (str, bytes, bytearray)):
+        return json_loads(body or "{}")
+    return body if isinstance(body, dict) else event
+
+
+def _new_correlation_id() -> str:
+    """Return a random RFC 4122 version 4 UUID string without building a ``uuid.UUID``."""
+    raw = bytearray(os.urandom(16))
+    raw[6] = (raw[6] & 0x0F) | 0x40
+    raw[8] = (raw[8] & 0x3F) | 0x80
+    digits = raw.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
 
 
 def _build_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "statusCode": status_code,
         "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(body),
+        "body": json_dumps(body),
     }
 
 
-def _authenticate_request(event: Dict[str, Any], config: EnvConfig) -> None:
+def _normalize_headers(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the request headers keyed by lower-cased name.
+
+    API Gateway HTTP APIs lower-case header names while REST APIs preserve them,
+    so every header lookup goes through this single normalized view.
+    """
+    headers = event.get("headers") if isinstance(event, dict) else None
+    if not isinstance(headers, dict):
+        return {}
+    return {key.lower(): value for key, value in headers.items()}
+
+
+def _authenticate_request(headers: Dict[str, Any], config: EnvConfig) -> None:
     token = config.api_auth_token
     if not token:
         return
 
-    headers = event.get("headers") if isinstance(event, dict) else None
     provided = None
-    if isinstance(headers, dict):
-        auth_header = headers.get("Authorization") or headers.get("authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            provided = auth_header.split(" ", 1)[1].strip()
+    auth_header = headers.get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        provided = auth_header.split(" ", 1)[1].strip()
 
     if provided != token:
         raise AuthorizationError("Unauthorized", status_code=401)
 
 
-def _extract_client_id(event: Dict[str, Any], config: EnvConfig) -> str:
-    headers = event.get("headers") if isinstance(event, dict) else None
-    normalized_headers = {k.lower(): v for k, v in headers.items()} if isinstance(headers, dict) else {}
-
+def _extract_client_id(headers: Dict[str, Any], config: EnvConfig) -> str:
     client_id = None
-    for key in ("client-id", "client_id", "clientid", "x-client-id"):
-        if key in normalized_headers:
-            client_id = normalized_headers.get(key)
+    for key in _CLIENT_ID_HEADERS:
+        if key in headers:
+            client_id = headers[key]
             break
 
     if not client_id or not isinstance(client_id, str):
@@ -72,91 +148,391 @@ def _extract_client_id(event: Dict[str, Any], config: EnvConfig) -> str:
 
 
 def _enqueue_cancellation(config: EnvConfig, payload: Dict[str, Any], correlation_id: str) -> None:
-    message_body = json.dumps({**payload, "correlationId": correlation_id})
     sqs_client().send_message(
         QueueUrl=config.sqs_queue_url,
-        MessageBody=message_body,
-        MessageAttributes={
-            "CorrelationId": {
-                "StringValue": correlation_id,
-                "DataType": "String",
-            }
-        },
+        MessageBody=json_dumps(payload),
+        MessageAttributes=correlation_attributes(correlation_id),
     )
 
 
+def _status_item(config: EnvConfig, payload: Dict[str, Any], correlation_id: str, now: str) -> Dict[str, Any]:
+    """Build the full LATEST item for ``BatchWriteItem``, which only supports puts."""
+    now_value = {"S": now}
+    item = {
+        config.partition_key: {"S": f"DCE#{payload['id']}"},
+        config.sort_key: _LATEST_SORT_KEY,
+        "status": _STATUS_VALUE,
+        "correlationId": {"S": correlation_id},
+        "eventCode": _EVENT_CODE_VALUE,
+        "updatedAt": now_value,
+        "eventTimestamp": {"S": payload["eventCancelDate"]},
+        "requestedAt": now_value,
+        "cancellationReason": {"S": payload["cancelReason"]},
+        "operationStatus": _OPERATION_STATUS_VALUE,
+        "clientId": {"S": payload["clientId"]},
+    }
+    if config.enqueue_via_stream:
+        item["messageBody"] = {"S": json_dumps(payload)}
+    return item
+
+
 def _upsert_cancellation_status(config: EnvConfig, payload: Dict[str, Any], correlation_id: str) -> None:
-    now = datetime.now(timezone.utc).isoformat()
-    client = dynamodb_client()
-    client.update_item(
+    now = {"S": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    attribute_values = {
+        ":status": _STATUS_VALUE,
+        ":correlationId": {"S": correlation_id},
+        ":eventCode": _EVENT_CODE_VALUE,
+        ":updatedAt": now,
+        ":eventTimestamp": {"S": payload["eventCancelDate"]},
+        ":requestedAt": now,
+        ":reason": {"S": payload["cancelReason"]},
+        ":operationStatus": _OPERATION_STATUS_VALUE,
+        ":clientId": {"S": payload["clientId"]},
+    }
+    update_expression = _STATUS_UPDATE_EXPRESSION
+    if config.enqueue_via_stream:
+        attribute_values[":messageBody"] = {"S": json_dumps(payload)}
+        update_expression = _STATUS_WITH_MESSAGE_UPDATE_EXPRESSION
+
+    dynamodb_client().update_item(
         TableName=config.dce_table_name,
         Key={
             config.partition_key: {"S": f"DCE#{payload['id']}"},
-            config.sort_key: {"S": "LATEST"},
-        },
-        UpdateExpression=(
-            "SET #status = :status, correlationId = :correlationId, "
-            "eventCode = :eventCode, updatedAt = :updatedAt, eventTimestamp = :eventTimestamp, "
-            "requestedAt = :requestedAt, cancellationReason = :reason, operationStatus = :operationStatus, "
-            "clientId = :clientId"
-        ),
-        ExpressionAttributeNames={"#status": "status"},
-        ExpressionAttributeValues={
-            ":status": {"S": "CANCELLATION_REQUESTED"},
-            ":correlationId": {"S": correlation_id},
-            ":eventCode": {"S": EVENT_CODE},
-            ":updatedAt": {"S": now},
-            ":eventTimestamp": {"S": payload["eventCancelDate"]},
-            ":requestedAt": {"S": now},
-            ":reason": {"S": payload["cancelReason"]},
-            ":operationStatus": {"S": "RECEIVED"},
-            ":clientId": {"S": payload["clientId"]},
+            config.sort_key: _LATEST_SORT_KEY,
         },
+        UpdateExpression=update_expression,
+        ExpressionAttributeNames=_STATUS_ATTRIBUTE_NAMES,
+        ExpressionAttributeValues=attribute_values,
+        ReturnValues="NONE",
+        ReturnConsumedCapacity="NONE",
+        ReturnItemCollectionMetrics="NONE",
     )
 
 
+def _dispatch_cancellation(config: EnvConfig, payload: Dict[str, Any], correlation_id: str) -> None:
+    if config.enqueue_via_stream:
+        _upsert_cancellation_status(config, payload, correlation_id)
+        return
+
+    enqueue = _EXECUTOR.submit(_enqueue_cancellation, config, payload, correlation_id)
+    upsert = _EXECUTOR.submit(_upsert_cancellation_status, config, payload, correlation_id)
+    try:
+        enqueue.result()
+    except Exception:
+        # The status write runs concurrently, so it may have recorded RECEIVED for
+        # a message that was never queued; mark it before surfacing the error.
+        if upsert.exception() is None:
+            _mark_enqueue_failed(config, payload, correlation_id)
+        raise
+    upsert.result()
+
+
+def _mark_enqueue_failed(config: EnvConfig, payload: Dict[str, Any], correlation_id: str) -> None:
+    try:
+        dynamodb_client().update_item(
+            TableName=config.dce_table_name,
+            Key={
+                config.partition_key: {"S": f"DCE#{payload['id']}"},
+                config.sort_key: _LATEST_SORT_KEY,
+            },
+            UpdateExpression=_ENQUEUE_FAILED_UPDATE_EXPRESSION,
+            ConditionExpression=_ENQUEUE_FAILED_CONDITION,
+            ExpressionAttributeValues={
+                ":operationStatus": _ENQUEUE_FAILED_VALUE,
+                ":updatedAt": {"S": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+                ":correlationId": {"S": correlation_id},
+            },
+            ReturnValues="NONE",
+            ReturnConsumedCapacity="NONE",
+            ReturnItemCollectionMetrics="NONE",
+        )
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return  # a newer request already owns the LATEST snapshot
+        logger.error("Failed to mark enqueue failure for %s: %s", payload["id"], exc)
+    except BotoCoreError as exc:
+        logger.error("Failed to mark enqueue failure for %s: %s", payload["id"], exc)
+
+
 def _authorize_client(access_key: str, client_id: str, table_name: str) -> None:
-    table = dynamodb_resource().Table(table_name)
-    response = table.query(
-        KeyConditionExpression=Key("accessKey").eq(access_key),
-        FilterExpression=Attr("clientId").eq(client_id),
-        Limit=1,
+    # Select=COUNT keeps DynamoDB from returning item attributes. No Limit is set
+    # because it would apply before the clientId filter and could hide a match.
+    response = dynamodb_client().query(
+        TableName=table_name,
+        KeyConditionExpression=_AUTHORIZATION_KEY_CONDITION,
+        FilterExpression=_AUTHORIZATION_FILTER,
+        ExpressionAttributeValues={":accessKey": {"S": access_key}, ":clientId": {"S": client_id}},
+        Select="COUNT",
+        ReturnConsumedCapacity="NONE",
     )
 
-    if not response.get("Items"):
+    if not response.get("Count"):
         raise AuthorizationError("clientId is not authorized to cancel this DCe")
 
 
+def _is_batch(event: Any) -> bool:
+    """Return whether ``event`` is an SQS event source batch.
+
+    Other ``Records`` events (a DynamoDB Stream wired here instead of to
+    ``stream_forwarder``, for example) raise so the invocation fails and the
+    source retries them, rather than being dropped as invalid payloads.
+    """
+    if not isinstance(event, dict) or not isinstance(event.get("Records"), list):
+        return False
+    sources = {record.get("eventSource") if isinstance(record, dict) else None for record in event["Records"]}
+    sources.discard(_SQS_EVENT_SOURCE)
+    if sources:
+        raise ValueError(f"Unsupported event source(s) for the cancellation handler: {sorted(map(str, sources))}")
+    return True
+
+
+def _build_enqueue_payload(validated: Any, correlation_id: str) -> Dict[str, Any]:
+    # correlationId is part of the SQS message body, so it is included up front
+    # rather than merged into a copy of the payload at send time.
+    return {
+        "id": validated.document_id,
+        "eventCancelDate": validated.event_cancel_date,
+        "cancelReason": validated.cancel_reason,
+        "clientId": validated.client_id,
+        "eventCode": EVENT_CODE,
+        "correlationId": correlation_id,
+    }
+
+
+def _backoff(attempt: int) -> None:
+    time.sleep(_BATCH_BASE_DELAY_SECONDS * (2**attempt))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, ClientError):
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return exc.response.get("Error", {}).get("Code") in _THROTTLING_ERROR_CODES or status >= 500
+    return isinstance(exc, (BotoConnectionError, HTTPClientError))
+
+
+def _parse_record(record: Dict[str, Any]) -> Tuple[Dict[str, Any], str, str | None] | str:
+    """Extract ``(payload, client_id, correlation_id)`` from an SQS record, or return the error."""
+    body = record.get("body")
+    try:
+        payload_dict = json_loads(body or "{}") if isinstance(body, (str, bytes)) else body
+    except ValueError:
+        return "body must be valid JSON"
+    if type(payload_dict) is not dict:
+        return "payload must be a JSON object"
+
+    attributes = record.get("messageAttributes") or {}
+    client_id = (attributes.get("ClientId") or {}).get("stringValue") or payload_dict.get("clientId")
+    if not client_id or not isinstance(client_id, str):
+        return "clientId is required"
+
+    correlation_id = (attributes.get("CorrelationId") or {}).get("stringValue") or payload_dict.get(
+        "correlationId"
+    )
+    if not correlation_id or not isinstance(correlation_id, str):
+        # Anything else would fail serialization for the whole chunk; a fresh id
+        # is assigned in ``_handle_batch`` instead.
+        correlation_id = None
+    return payload_dict, client_id, correlation_id
+
+
+def _send_message_batch(config: EnvConfig, messages: List[Tuple[str, Dict[str, Any], str]]) -> List[str]:
+    """Send ``(record_id, payload, correlation_id)`` messages, returning the ids that failed."""
+    failed: List[str] = []
+    for start in range(0, len(messages), SQS_BATCH_SIZE):
+        pending = {
+            str(index): {
+                "Id": str(index),
+                "MessageBody": json_dumps(payload),
+                "MessageAttributes": correlation_attributes(correlation_id),
+            }
+            for index, (_, payload, correlation_id) in enumerate(messages[start : start + SQS_BATCH_SIZE], start)
+        }
+        for attempt in range(_BATCH_MAX_ATTEMPTS):
+            if attempt:
+                _backoff(attempt)
+            try:
+                response = sqs_client().send_message_batch(
+                    QueueUrl=config.sqs_queue_url, Entries=list(pending.values())
+                )
+            except (ClientError, BotoCoreError) as exc:
+                logger.warning("SendMessageBatch attempt %d failed: %s", attempt + 1, exc)
+                if _is_retryable(exc):
+                    continue
+                break
+            retry = {}
+            for entry in response.get("Failed", []):
+                if entry.get("SenderFault"):
+                    # Sender faults (invalid body or attributes) fail the same way on retry.
+                    logger.warning("SendMessageBatch rejected entry %s: %s", entry["Id"], entry.get("Code"))
+                    failed.append(messages[int(entry["Id"])][0])
+                else:
+                    retry[entry["Id"]] = pending[entry["Id"]]
+            pending = retry
+            if not pending:
+                break
+        failed.extend(messages[int(index)][0] for index in pending)
+    return failed
+
+
+def _put_status_items(config: EnvConfig, items: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Put ``items`` (keyed by DCe id) with ``BatchWriteItem``, returning the ids left unprocessed."""
+    unprocessed: List[str] = []
+    keys = list(items)
+    for start in range(0, len(keys), DYNAMODB_BATCH_SIZE):
+        chunk = keys[start : start + DYNAMODB_BATCH_SIZE]
+        request_items = {config.dce_table_name: [{"PutRequest": {"Item": items[key]}} for key in chunk]}
+        for attempt in range(_BATCH_MAX_ATTEMPTS):
+            if attempt:
+                _backoff(attempt)
+            try:
+                response = dynamodb_client().batch_write_item(
+                    RequestItems=request_items,
+                    ReturnConsumedCapacity="NONE",
+                    ReturnItemCollectionMetrics="NONE",
+                )
+            except (ClientError, BotoCoreError) as exc:
+                logger.warning("BatchWriteItem attempt %d failed: %s", attempt + 1, exc)
+                if _is_retryable(exc):
+                    continue
+                break
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                break
+        for request in request_items.get(config.dce_table_name, []):
+            unprocessed.append(request["PutRequest"]["Item"][config.partition_key]["S"][len("DCE#") :])
+    return unprocessed
+
+
+def _write_status_batch(config: EnvConfig, messages: List[Tuple[str, Dict[str, Any], str]]) -> List[str]:
+    """Write LATEST status items with ``BatchWriteItem``, returning the record ids that failed.
+
+    A request may not contain the same key twice, so repeated records for one DCe
+    are written in successive rounds in arrival order. Every record therefore
+    reaches the table (and its stream, for ``ENQUEUE_VIA_STREAM``) and the last one
+    ends up as LATEST. Once a DCe's write fails, its later records are failed too
+    so a redelivery cannot overwrite a newer snapshot with an older one.
+    """
+    now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    rounds: List[Dict[str, Tuple[str, Dict[str, Any]]]] = []
+    occurrences: Dict[str, int] = {}
+    for record_id, payload, correlation_id in messages:
+        key = payload["id"]
+        index = occurrences.get(key, 0)
+        occurrences[key] = index + 1
+        if index == len(rounds):
+            rounds.append({})
+        rounds[index][key] = (record_id, _status_item(config, payload, correlation_id, now))
+
+    failed: List[str] = []
+    failed_keys: Set[str] = set()
+    for round_items in rounds:
+        items = {}
+        for key, (record_id, item) in round_items.items():
+            if key in failed_keys:
+                failed.append(record_id)
+            else:
+                items[key] = item
+        for key in _put_status_items(config, items):
+            failed_keys.add(key)
+            failed.append(round_items[key][0])
+    return failed
+
+
+def _handle_batch(event: Dict[str, Any], config: EnvConfig) -> Dict[str, Any]:
+    """Process an SQS event source batch, reporting retryable failures per record.
+
+    Records that fail validation or authorization are logged and dropped since
+    retrying them cannot succeed; AWS failures (the authorization lookup or the
+    dispatch) are reported back through ``batchItemFailures`` so only those
+    records are redelivered.
+    """
+    accepted: List[Tuple[str, Any, str | None]] = []
+    for record in event["Records"]:
+        record_id = record.get("messageId", "")
+        parsed = _parse_record(record)
+        if isinstance(parsed, str):
+            logger.warning("Dropping record %s: %s", record_id, parsed)
+            continue
+        payload_dict, client_id, correlation_id = parsed
+        validated = check_payload(payload_dict, cancellation_deadline_minutes=config.cancellation_deadline_minutes)
+        if isinstance(validated, str):
+            logger.warning("Dropping record %s: %s", record_id, validated)
+            continue
+        validated.client_id = client_id
+        accepted.append((record_id, validated, correlation_id))
+
+    # Each distinct (DCe, client) pair is looked up once, and the lookups run
+    # concurrently instead of one round trip per record.
+    lookups = {}
+    for _, validated, _ in accepted:
+        pair = (validated.document_id, validated.client_id)
+        if pair not in lookups:
+            lookups[pair] = _EXECUTOR.submit(_authorize_client, *pair, config.log_dce_table_name)
+
+    messages: List[Tuple[str, Dict[str, Any], str]] = []
+    failed: Set[str] = set()
+    for record_id, validated, correlation_id in accepted:
+        exc = lookups[(validated.document_id, validated.client_id)].exception()
+        if isinstance(exc, AuthorizationError):
+            logger.warning("Dropping record %s: %s", record_id, exc)
+            continue
+        if isinstance(exc, (ClientError, BotoCoreError)):
+            logger.error("Authorization lookup failed for record %s: %s", record_id, exc)
+            failed.add(record_id)
+            continue
+        if exc is not None:
+            raise exc
+        correlation_id = correlation_id or _new_correlation_id()
+        messages.append((record_id, _build_enqueue_payload(validated, correlation_id), correlation_id))
+
+    if config.enqueue_via_stream:
+        failed.update(_write_status_batch(config, messages))
+    else:
+        sqs_future = _EXECUTOR.submit(_send_message_batch, config, messages)
+        dynamodb_future = _EXECUTOR.submit(_write_status_batch, config, messages)
+        failed.update(sqs_future.result(), dynamodb_future.result())
+
+    if failed:
+        logger.error("Failed to dispatch %d cancellation record(s)", len(failed))
+
+    return {"batchItemFailures": [{"itemIdentifier": record_id} for record_id in sorted(failed)]}
+
+
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    logger.info("Received event: %s", event)
+    # Full events include every API Gateway header (Authorization among them) and
+    # the request context, so they are only logged when DEBUG is enabled.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", event)
+    if _is_batch(event):
+        return _handle_batch(event, EnvConfig.load())
+
     try:
-        payload_dict = _parse_event(event)
+        try:
+            payload_dict = _parse_event(event)
+        except ValueError:
+            # Covers malformed JSON and, for bytes bodies, invalid UTF-8.
+            return _build_response(400, {"error": "body must be valid JSON"})
         config = EnvConfig.load()
-        _authenticate_request(event, config)
-        client_id = _extract_client_id(event, config)
-        validated = validate_payload(
+        headers = _normalize_headers(event)
+        _authenticate_request(headers, config)
+        client_id = _extract_client_id(headers, config)
+        validated = check_payload(
             payload_dict, cancellation_deadline_minutes=config.cancellation_deadline_minutes
         )
+        if isinstance(validated, str):
+            logger.warning("Validation failed: %s", validated)
+            return _build_response(400, {"error": validated})
         validated.client_id = client_id
 
         _authorize_client(validated.document_id, validated.client_id, config.log_dce_table_name)
 
         correlation_id = (
-            event.get("headers", {}).get("X-Correlation-Id")
-            if isinstance(event, dict)
-            else None
-        ) or payload_dict.get("correlationId") or str(uuid.uuid4())
-
-        enqueue_payload = {
-            "id": validated.document_id,
-            "eventCancelDate": validated.event_cancel_date,
-            "cancelReason": validated.cancel_reason,
-            "clientId": validated.client_id,
-            "eventCode": EVENT_CODE,
-        }
+            headers.get("x-correlation-id") or payload_dict.get("correlationId") or _new_correlation_id()
+        )
+
+        enqueue_payload = _build_enqueue_payload(validated, correlation_id)
 
-        _enqueue_cancellation(config, enqueue_payload, correlation_id)
-        _upsert_cancellation_status(config, enqueue_payload, correlation_id)
+        _dispatch_cancellation(config, enqueue_payload, correlation_id)
 
         logger.info(
             "Cancellation request recorded",
@@ -178,9 +554,6 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     except AuthorizationError as exc:
         logger.warning("Authorization failed: %s", exc)
         return _build_response(getattr(exc, "status_code", 403), {"error": str(exc)})
-    except ValidationError as exc:
-        logger.warning("Validation failed: %s", exc)
-        return _build_response(400, {"error": str(exc)})
     except (ClientError, BotoCoreError) as exc:
         logger.error("AWS client error: %s", exc, exc_info=True)
         return _build_response(502, {"error": "Failed to dispatch cancellation event"})
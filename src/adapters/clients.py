@@ -1,21 +1,34 @@
-"""Client factories for AWS services used by the Lambda."""
+"""Client factories for AWS services used by the Lambda.
+
+Clients are created lazily and cached at module scope so that warm Lambda
+containers reuse them (and their connection pools) across invocations.
+"""
 from __future__ import annotations
 
 import boto3
-from boto3.session import Session
+from botocore.config import Config
 
+# TCP keep-alive keeps pooled connections usable across frozen/thawed warm
+# invocations; standard retry mode with at most two retries bounds tail latency.
+_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"max_attempts": 2, "mode": "standard"},
+)
 
-def _get_session() -> Session:
-    return boto3.session.Session()
+_SQS = None
+_DDB = None
 
 
 def sqs_client():
-    return _get_session().client("sqs")
+    global _SQS
+    if _SQS is None:
+        _SQS = boto3.client("sqs", config=_CONFIG)
+    return _SQS
 
 
 def dynamodb_client():
-    return _get_session().client("dynamodb")
-
-
-def dynamodb_resource():
-    return _get_session().resource("dynamodb")
+    global _DDB
+    if _DDB is None:
+        _DDB = boto3.client("dynamodb", config=_CONFIG)
+    return _DDB
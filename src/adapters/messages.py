@@ -0,0 +1,15 @@
+"""SQS message helpers shared by every producer of cancellation messages."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+SQS_BATCH_SIZE = 10
+
+
+def correlation_attributes(correlation_id: str) -> Dict[str, Any]:
+    return {
+        "CorrelationId": {
+            "StringValue": correlation_id,
+            "DataType": "String",
+        }
+    }
@@ -0,0 +1,24 @@
+"""JSON helpers: stdlib decoding and ``orjson`` encoding when available.
+
+Decoding stays on the stdlib because orjson turns integers wider than 64 bits
+into floats, which would corrupt numeric 44-digit DCe access keys.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only where orjson is absent
+    orjson = None
+
+
+def json_loads(data: str | bytes | bytearray) -> Any:
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
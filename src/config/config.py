@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass
@@ -14,9 +15,16 @@ class EnvConfig:
     api_auth_token: str | None = None
     log_dce_table_name: str = "logDce"
     cancellation_deadline_minutes: int = 60 * 24
+    enqueue_via_stream: bool = False
 
     @classmethod
+    @lru_cache(maxsize=1)
     def load(cls) -> "EnvConfig":
+        """Load the configuration from the environment once per container.
+
+        Lambda environment variables do not change during a container's lifetime,
+        so the result is cached; call ``EnvConfig.load.cache_clear()`` to reload.
+        """
         queue_url = os.getenv("SQS_QUEUE_URL")
         table_name = os.getenv("DCE_TABLE_NAME")
         partition_key = os.getenv("DCE_TABLE_PK", "pk")
@@ -26,6 +34,7 @@ class EnvConfig:
         cancellation_deadline_minutes = int(
             os.getenv("CANCELLATION_DEADLINE_MINUTES", cls.cancellation_deadline_minutes)
         )
+        enqueue_via_stream = os.getenv("ENQUEUE_VIA_STREAM", "false").lower() in ("1", "true", "yes")
 
         missing = [
             name
@@ -46,4 +55,5 @@ class EnvConfig:
             api_auth_token=api_auth_token,
             log_dce_table_name=log_dce_table_name,
             cancellation_deadline_minutes=cancellation_deadline_minutes,
+            enqueue_via_stream=enqueue_via_stream,
         )
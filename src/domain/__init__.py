@@ -1,5 +1,5 @@
 """Domain logic for DCe cancellation."""
 from domain.models.payload import ValidatedPayload
-from domain.services.validation import validate_payload
+from domain.services.validation import check_payload, validate_payload
 
-__all__ = ["validate_payload", "ValidatedPayload"]
+__all__ = ["check_payload", "validate_payload", "ValidatedPayload"]
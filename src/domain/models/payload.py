@@ -5,7 +5,7 @@ import datetime as dt
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidatedPayload:
     """Represents a payload that has passed domain validation rules."""
 
@@ -1,4 +1,4 @@
 """Domain services."""
-from domain.services.validation import validate_payload
+from domain.services.validation import check_payload, validate_payload
 
-__all__ = ["validate_payload"]
+__all__ = ["check_payload", "validate_payload"]
@@ -7,37 +7,59 @@ from typing import Any, Dict
 from exceptions import ValidationError
 from domain.models.payload import ValidatedPayload
 
+_UTC = dt.timezone.utc
 
-def validate_payload(
+
+def check_payload(
     payload: Dict[str, Any], cancellation_deadline_minutes: int | None = None
-) -> ValidatedPayload:
+) -> ValidatedPayload | str:
     """Validate the incoming payload and enrich it with the current timestamp.
 
+    Returns the error message instead of raising so that request paths can reject
+    invalid payloads without building an exception and traceback.
+
     ``eventCancelDate`` is no longer provided by the requester; it is populated at
     validation time using the current UTC timestamp.
     """
 
-    if not isinstance(payload, dict):
-        raise ValidationError("payload must be a JSON object")
+    # Payloads come from JSON decoding or a direct Lambda invocation, both of which
+    # produce plain dicts, so an exact type check is enough.
+    if type(payload) is not dict:
+        return "payload must be a JSON object"
 
     document_id = payload.get("id")
     cancel_reason = payload.get("cancelReason")
 
     if not document_id:
-        raise ValidationError("id is required")
+        return "id is required"
+    # Exact type check: bool is an int subclass and would otherwise be stored as
+    # "True", and floats, lists or objects would be stringified into bogus keys.
+    if type(document_id) not in (str, int):
+        return "id must be a string or integer"
     if not cancel_reason:
-        raise ValidationError("cancelReason is required")
+        return "cancelReason is required"
 
     if not isinstance(cancel_reason, str):
-        raise ValidationError("cancelReason must be a string")
+        return "cancelReason must be a string"
 
-    now_dt = dt.datetime.now(dt.timezone.utc)
-    now_iso = now_dt.isoformat()
+    now_dt = dt.datetime.now(_UTC)
+    now_iso = now_dt.isoformat(timespec="milliseconds")
 
     return ValidatedPayload(
-        document_id=str(document_id),
+        document_id=document_id if type(document_id) is str else str(document_id),
         event_cancel_date=now_iso,
         event_cancel_date_dt=now_dt,
-        cancel_reason=str(cancel_reason),
+        cancel_reason=cancel_reason,
         client_id="",  # populated after client validation in the handler
     )
+
+
+def validate_payload(
+    payload: Dict[str, Any], cancellation_deadline_minutes: int | None = None
+) -> ValidatedPayload:
+    """Validate the incoming payload, raising ``ValidationError`` when it is invalid."""
+
+    result = check_payload(payload, cancellation_deadline_minutes=cancellation_deadline_minutes)
+    if isinstance(result, str):
+        raise ValidationError(result)
+    return result
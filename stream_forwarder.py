@@ -0,0 +1,79 @@
+"""AWS Lambda handler that forwards cancellation messages from DynamoDB Streams to SQS.
+
+Used when the request handler runs with ``ENQUEUE_VIA_STREAM`` enabled: the
+request path only writes the status item (including ``messageBody``) and this
+function publishes the message to the queue asynchronously.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, List
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from adapters.clients import sqs_client
+from adapters.messages import SQS_BATCH_SIZE, correlation_attributes
+from config.config import EnvConfig
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+
+def _message_from_record(record: Dict[str, Any]) -> Dict[str, str] | None:
+    if record.get("eventName") not in ("INSERT", "MODIFY"):
+        return None
+
+    dynamodb = record.get("dynamodb") or {}
+    new_image = dynamodb.get("NewImage") or {}
+    body = (new_image.get("messageBody") or {}).get("S")
+    if not body:
+        return None
+
+    # Only forward writes that carry a new message; unrelated updates to the
+    # item keep the previous messageBody and must not be re-published.
+    old_body = ((dynamodb.get("OldImage") or {}).get("messageBody") or {}).get("S")
+    if body == old_body:
+        return None
+
+    return {
+        "sequenceNumber": dynamodb.get("SequenceNumber", ""),
+        "body": body,
+        "correlationId": (new_image.get("correlationId") or {}).get("S", ""),
+    }
+
+
+def _send_batch(queue_url: str, messages: List[Dict[str, str]]) -> List[str]:
+    entries = [
+        {
+            "Id": str(index),
+            "MessageBody": message["body"],
+            "MessageAttributes": correlation_attributes(message["correlationId"]),
+        }
+        for index, message in enumerate(messages)
+    ]
+    try:
+        response = sqs_client().send_message_batch(QueueUrl=queue_url, Entries=entries)
+    except (ClientError, BotoCoreError) as exc:
+        logger.error("AWS client error: %s", exc, exc_info=True)
+        return [message["sequenceNumber"] for message in messages]
+
+    return [messages[int(failed["Id"])]["sequenceNumber"] for failed in response.get("Failed", [])]
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    config = EnvConfig.load()
+    messages = [
+        message
+        for message in map(_message_from_record, event.get("Records", []))
+        if message is not None
+    ]
+
+    failures: List[str] = []
+    for start in range(0, len(messages), SQS_BATCH_SIZE):
+        failures.extend(_send_batch(config.sqs_queue_url, messages[start : start + SQS_BATCH_SIZE]))
+
+    if failures:
+        logger.warning("Failed to forward %d cancellation message(s)", len(failures))
+
+    return {"batchItemFailures": [{"itemIdentifier": sequence} for sequence in failures]}
@@ -0,0 +1,10 @@
+import pytest
+
+from config.config import EnvConfig
+
+
+@pytest.fixture(autouse=True)
+def _reload_env_config():
+    EnvConfig.load.cache_clear()
+    yield
+    EnvConfig.load.cache_clear()
@@ -1,6 +1,11 @@
+import importlib
 import json
+import logging
+import re
+import uuid
 from unittest.mock import MagicMock, patch
 
+import pytest
 from datetime import datetime, timezone
 from botocore.exceptions import ClientError
 
@@ -21,12 +26,10 @@ def _mock_client():
     return MagicMock()
 
 
-def _mock_dynamodb_resource(items=None):
-    resource = _mock_client()
-    table = _mock_client()
-    table.query.return_value = {"Items": items if items is not None else [{}]}
-    resource.Table.return_value = table
-    return resource, table
+def _mock_dynamodb_client(count=1):
+    client = _mock_client()
+    client.query.return_value = {"Count": count, "ScannedCount": count}
+    return client
 
 
 def test_successful_enqueue_and_update(monkeypatch):
@@ -37,13 +40,12 @@ def test_successful_enqueue_and_update(monkeypatch):
     monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
 
     sqs_mock = _mock_client()
-    dynamodb_mock = _mock_client()
-    dynamodb_resource_mock, log_table_mock = _mock_dynamodb_resource()
+    dynamodb_mock = _mock_dynamodb_client()
     payload = _fresh_payload()
 
     with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
         "lambada_handler.dynamodb_client", return_value=dynamodb_mock
-    ), patch("lambada_handler.dynamodb_resource", return_value=dynamodb_resource_mock):
+    ):
         response = lambada_handler.handler(
             {
                 "body": json.dumps(payload),
@@ -54,7 +56,14 @@ def test_successful_enqueue_and_update(monkeypatch):
 
     assert response["statusCode"] == 201
 
-    log_table_mock.query.assert_called_once()
+    dynamodb_mock.query.assert_called_once()
+    query_kwargs = dynamodb_mock.query.call_args.kwargs
+    assert query_kwargs["TableName"] == "logDce"
+    assert query_kwargs["Select"] == "COUNT"
+    assert query_kwargs["ExpressionAttributeValues"] == {
+        ":accessKey": {"S": payload["id"]},
+        ":clientId": {"S": "partner-123"},
+    }
 
     sqs_mock.send_message.assert_called_once()
     call_kwargs = sqs_mock.send_message.call_args.kwargs
@@ -64,16 +73,83 @@ def test_successful_enqueue_and_update(monkeypatch):
     assert body["eventCode"] == "110111"
 
     dynamodb_mock.update_item.assert_called_once()
-    assert dynamodb_mock.update_item.call_args.kwargs["TableName"] == "dce-table"
-    update_values = dynamodb_mock.update_item.call_args.kwargs["ExpressionAttributeValues"]
+    update_kwargs = dynamodb_mock.update_item.call_args.kwargs
+    assert update_kwargs["TableName"] == "dce-table"
+    assert update_kwargs["Key"] == {"pk": {"S": f"DCE#{payload['id']}"}, "sk": {"S": "LATEST"}}
+    assert "messageBody" not in update_kwargs["UpdateExpression"]
+    assert update_kwargs["ReturnConsumedCapacity"] == "NONE"
+    update_values = update_kwargs["ExpressionAttributeValues"]
     assert update_values[":clientId"]["S"] == "partner-123"
     assert update_values[":status"]["S"] == "CANCELLATION_REQUESTED"
     event_timestamp = update_values[":eventTimestamp"]["S"]
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}\+00:00", event_timestamp)
+    assert body["eventCancelDate"] == event_timestamp
     parsed_event_timestamp = datetime.fromisoformat(event_timestamp.replace("Z", "+00:00"))
     assert (datetime.now(timezone.utc) - parsed_event_timestamp).total_seconds() < 30
     assert update_values[":reason"]["S"] == payload["cancelReason"]
 
 
+def test_large_numeric_id_keeps_every_digit(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    access_key = "35230512345678901234550010000000011000000011"
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": '{"id": %s, "cancelReason": "Duplicidade"}' % access_key,
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 201
+    assert json.loads(response["body"])["dceId"] == access_key
+    query_values = dynamodb_mock.query.call_args.kwargs["ExpressionAttributeValues"]
+    assert query_values[":accessKey"] == {"S": access_key}
+    assert dynamodb_mock.update_item.call_args.kwargs["Key"]["pk"] == {"S": f"DCE#{access_key}"}
+    assert json.loads(sqs_mock.send_message.call_args.kwargs["MessageBody"])["id"] == access_key
+
+
+def test_enqueue_via_stream_only_writes_dynamodb(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+    monkeypatch.setenv("ENQUEUE_VIA_STREAM", "true")
+
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+    payload = _fresh_payload()
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(payload),
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 201
+    sqs_mock.send_message.assert_not_called()
+    dynamodb_mock.update_item.assert_called_once()
+    update_kwargs = dynamodb_mock.update_item.call_args.kwargs
+    assert "messageBody = :messageBody" in update_kwargs["UpdateExpression"]
+    message = json.loads(update_kwargs["ExpressionAttributeValues"][":messageBody"]["S"])
+    assert message["id"] == payload["id"]
+    assert message["correlationId"] == json.loads(response["body"])["correlationId"]
+
+
 def test_validation_failure_returns_400(monkeypatch):
     monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
     monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
@@ -92,10 +168,76 @@ def test_validation_failure_returns_400(monkeypatch):
         )
 
     assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "id is required"}
+    sqs_mock.return_value.send_message.assert_not_called()
+    dynamodb_mock.return_value.update_item.assert_not_called()
+
+
+def test_bytes_body_is_decoded(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(VALID_PAYLOAD, ensure_ascii=False).encode("utf-8"),
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 201
+    body = json.loads(sqs_mock.send_message.call_args.kwargs["MessageBody"])
+    assert body["cancelReason"] == VALID_PAYLOAD["cancelReason"]
+
+
+def test_invalid_utf8_body_returns_400(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+
+    with patch("lambada_handler.sqs_client") as sqs_mock, patch(
+        "lambada_handler.dynamodb_client"
+    ) as dynamodb_mock:
+        response = lambada_handler.handler(
+            {
+                "body": b'{"id": "1234567890", "cancelReason": "\xff\xfe"}',
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "body must be valid JSON"}
     sqs_mock.return_value.send_message.assert_not_called()
     dynamodb_mock.return_value.update_item.assert_not_called()
 
 
+@pytest.mark.parametrize("document_id", [True, [1, 2], {"key": "1"}, 1.5])
+def test_non_string_or_integer_id_returns_400(monkeypatch, document_id):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+
+    response = lambada_handler.handler(
+        {
+            "body": json.dumps({**_fresh_payload(), "id": document_id}),
+            "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+        },
+        None,
+    )
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"]) == {"error": "id must be a string or integer"}
+
+
 def test_sqs_failure_returns_502(monkeypatch):
     monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
     monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
@@ -105,13 +247,12 @@ def test_sqs_failure_returns_502(monkeypatch):
     error_response = {"Error": {"Code": "500", "Message": "boom"}}
     sqs_mock = _mock_client()
     sqs_mock.send_message.side_effect = ClientError(error_response, "SendMessage")
-    dynamodb_mock = _mock_client()
-    dynamodb_resource_mock, _ = _mock_dynamodb_resource()
+    dynamodb_mock = _mock_dynamodb_client()
     payload = _fresh_payload()
 
     with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
         "lambada_handler.dynamodb_client", return_value=dynamodb_mock
-    ), patch("lambada_handler.dynamodb_resource", return_value=dynamodb_resource_mock):
+    ):
         response = lambada_handler.handler(
             {
                 "body": json.dumps(payload),
@@ -121,7 +262,103 @@ def test_sqs_failure_returns_502(monkeypatch):
         )
 
     assert response["statusCode"] == 502
-    dynamodb_mock.update_item.assert_not_called()
+    sqs_mock.send_message.assert_called_once()
+
+    # The concurrent status write must not be left as RECEIVED for a message that
+    # was never queued: it is followed by a conditional ENQUEUE_FAILED update.
+    assert dynamodb_mock.update_item.call_count == 2
+    status_write, failure_mark = (call.kwargs for call in dynamodb_mock.update_item.call_args_list)
+    assert status_write["ExpressionAttributeValues"][":operationStatus"]["S"] == "RECEIVED"
+    assert failure_mark["Key"] == status_write["Key"]
+    assert failure_mark["ConditionExpression"] == "correlationId = :correlationId"
+    assert failure_mark["ExpressionAttributeValues"][":operationStatus"]["S"] == "ENQUEUE_FAILED"
+    assert (
+        failure_mark["ExpressionAttributeValues"][":correlationId"]
+        == status_write["ExpressionAttributeValues"][":correlationId"]
+    )
+
+
+def test_sqs_failure_skips_mark_when_status_write_also_fails(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    error_response = {"Error": {"Code": "500", "Message": "boom"}}
+    sqs_mock = _mock_client()
+    sqs_mock.send_message.side_effect = ClientError(error_response, "SendMessage")
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.update_item.side_effect = ClientError(error_response, "UpdateItem")
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(_fresh_payload()),
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 502
+    dynamodb_mock.update_item.assert_called_once()
+
+
+def test_sqs_failure_mark_ignores_newer_snapshot(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message.side_effect = ClientError({"Error": {"Code": "500", "Message": "boom"}}, "SendMessage")
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.update_item.side_effect = [
+        {},
+        ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "newer"}}, "UpdateItem"),
+    ]
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(_fresh_payload()),
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 502
+    assert dynamodb_mock.update_item.call_count == 2
+
+
+def test_dynamodb_failure_returns_502(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    error_response = {"Error": {"Code": "500", "Message": "boom"}}
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.update_item.side_effect = ClientError(error_response, "UpdateItem")
+    payload = _fresh_payload()
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(payload),
+                "headers": {"Authorization": "Bearer secret", "Client-Id": "partner-123"},
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 502
+    sqs_mock.send_message.assert_called_once()
 
 
 def test_rejects_unauthorized_client(monkeypatch):
@@ -132,9 +369,9 @@ def test_rejects_unauthorized_client(monkeypatch):
     monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
     payload = _fresh_payload()
 
-    dynamodb_resource_mock, _ = _mock_dynamodb_resource(items=[])
+    dynamodb_mock = _mock_dynamodb_client(count=0)
 
-    with patch("lambada_handler.dynamodb_resource", return_value=dynamodb_resource_mock):
+    with patch("lambada_handler.dynamodb_client", return_value=dynamodb_mock):
         response = lambada_handler.handler(
             {
                 "body": json.dumps(payload),
@@ -166,3 +403,299 @@ def test_requires_client_id_header(monkeypatch):
     response = lambada_handler.handler({"body": json.dumps(payload), "headers": {"Authorization": "Bearer secret"}}, None)
 
     assert response["statusCode"] == 401
+
+
+def _sqs_record(message_id, payload, client_id="partner-123"):
+    return {
+        "messageId": message_id,
+        "eventSource": "aws:sqs",
+        "body": json.dumps(payload),
+        "messageAttributes": {"ClientId": {"stringValue": client_id, "dataType": "String"}},
+    }
+
+
+def test_batch_records_use_batch_apis(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.return_value = {"Successful": [], "Failed": []}
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.return_value = {"UnprocessedItems": {}}
+    first = _fresh_payload()
+    duplicate = {**_fresh_payload(), "cancelReason": "Outro motivo"}
+    other = {**_fresh_payload(), "id": "999"}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "Records": [
+                    _sqs_record("m1", first),
+                    _sqs_record("m2", duplicate),
+                    _sqs_record("m3", other),
+                    _sqs_record("m4", {}),
+                    {"messageId": "m5", "eventSource": "aws:sqs", "body": "not json"},
+                ]
+            },
+            None,
+        )
+
+    assert response == {"batchItemFailures": []}
+    # m1 and m2 share a (DCe, client) pair, so only two lookups are made.
+    assert sorted(
+        call.kwargs["ExpressionAttributeValues"][":accessKey"]["S"] for call in dynamodb_mock.query.call_args_list
+    ) == ["1234567890", "999"]
+    sqs_mock.send_message.assert_not_called()
+    entries = sqs_mock.send_message_batch.call_args.kwargs["Entries"]
+    assert [json.loads(entry["MessageBody"])["id"] for entry in entries] == ["1234567890", "1234567890", "999"]
+
+    dynamodb_mock.update_item.assert_not_called()
+    # Repeated records for one DCe go in a later round so every record is written
+    # (and streamed) in arrival order, leaving the last one as LATEST.
+    first_round, second_round = (
+        call.kwargs["RequestItems"]["dce-table"] for call in dynamodb_mock.batch_write_item.call_args_list
+    )
+    assert [put["PutRequest"]["Item"]["pk"]["S"] for put in first_round] == ["DCE#1234567890", "DCE#999"]
+    assert first_round[0]["PutRequest"]["Item"]["cancellationReason"]["S"] == first["cancelReason"]
+    assert len(second_round) == 1
+    assert second_round[0]["PutRequest"]["Item"]["cancellationReason"]["S"] == "Outro motivo"
+
+
+def test_batch_reports_unprocessed_records(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+    monkeypatch.setattr(lambada_handler, "_BATCH_BASE_DELAY_SECONDS", 0)
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.side_effect = [
+        {"Failed": [{"Id": "1", "SenderFault": False}]},
+        {"Failed": []},
+    ]
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.side_effect = lambda RequestItems, **_: {"UnprocessedItems": RequestItems}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {"Records": [_sqs_record("m1", _fresh_payload()), _sqs_record("m2", {**_fresh_payload(), "id": "2"})]},
+            None,
+        )
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "m2"}]}
+    assert sqs_mock.send_message_batch.call_count == 2
+    assert [entry["Id"] for entry in sqs_mock.send_message_batch.call_args.kwargs["Entries"]] == ["1"]
+    assert dynamodb_mock.batch_write_item.call_count == lambada_handler._BATCH_MAX_ATTEMPTS
+
+
+def test_headers_are_matched_case_insensitively(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("API_AUTH_TOKEN", "secret")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "body": json.dumps(_fresh_payload()),
+                "headers": {
+                    "authorization": "Bearer secret",
+                    "X-Client-Id": "partner-123",
+                    "x-correlation-id": "corr-abc",
+                },
+            },
+            None,
+        )
+
+    assert response["statusCode"] == 201
+    assert json.loads(response["body"])["correlationId"] == "corr-abc"
+    assert dynamodb_mock.update_item.call_args.kwargs["ExpressionAttributeValues"][":clientId"]["S"] == "partner-123"
+
+
+def test_generated_correlation_id_is_uuid4():
+    correlation_id = lambada_handler._new_correlation_id()
+
+    assert str(uuid.UUID(correlation_id)) == correlation_id
+    assert uuid.UUID(correlation_id).version == 4
+
+
+def test_batch_reports_authorization_lookup_failure_per_record(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.return_value = {"Failed": []}
+    dynamodb_mock = _mock_dynamodb_client()
+
+    def query(ExpressionAttributeValues, **_):
+        if ExpressionAttributeValues[":accessKey"]["S"] == VALID_PAYLOAD["id"]:
+            raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow"}}, "Query")
+        return {"Count": 1}
+
+    dynamodb_mock.query.side_effect = query
+    dynamodb_mock.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {"Records": [_sqs_record("m1", _fresh_payload()), _sqs_record("m2", {**_fresh_payload(), "id": "2"})]},
+            None,
+        )
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    entries = sqs_mock.send_message_batch.call_args.kwargs["Entries"]
+    assert [json.loads(entry["MessageBody"])["id"] for entry in entries] == ["2"]
+
+
+def test_batch_does_not_retry_sender_faults(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.return_value = {
+        "Failed": [{"Id": "0", "SenderFault": True, "Code": "InvalidMessageContents"}]
+    }
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler({"Records": [_sqs_record("m1", _fresh_payload())]}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    sqs_mock.send_message_batch.assert_called_once()
+
+
+def test_batch_stream_mode_writes_every_duplicate_message(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+    monkeypatch.setenv("ENQUEUE_VIA_STREAM", "true")
+
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "Records": [
+                    _sqs_record("m1", _fresh_payload()),
+                    _sqs_record("m2", {**_fresh_payload(), "cancelReason": "Outro motivo"}),
+                ]
+            },
+            None,
+        )
+
+    assert response == {"batchItemFailures": []}
+    sqs_mock.send_message_batch.assert_not_called()
+    bodies = [
+        json.loads(call.kwargs["RequestItems"]["dce-table"][0]["PutRequest"]["Item"]["messageBody"]["S"])
+        for call in dynamodb_mock.batch_write_item.call_args_list
+    ]
+    assert [body["cancelReason"] for body in bodies] == [VALID_PAYLOAD["cancelReason"], "Outro motivo"]
+
+
+@pytest.mark.parametrize("correlation_id", [123, 2**70, "", ["corr"]])
+def test_batch_replaces_invalid_correlation_id(monkeypatch, correlation_id):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.return_value = {"Failed": []}
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.return_value = {"UnprocessedItems": {}}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler(
+            {
+                "Records": [
+                    _sqs_record("m1", {**_fresh_payload(), "correlationId": correlation_id}),
+                    _sqs_record("m2", {**_fresh_payload(), "id": "2", "correlationId": "corr-2"}),
+                ]
+            },
+            None,
+        )
+
+    assert response == {"batchItemFailures": []}
+    first, second = sqs_mock.send_message_batch.call_args.kwargs["Entries"]
+    generated = first["MessageAttributes"]["CorrelationId"]["StringValue"]
+    assert uuid.UUID(generated).version == 4
+    assert json.loads(first["MessageBody"])["correlationId"] == generated
+    assert second["MessageAttributes"]["CorrelationId"]["StringValue"] == "corr-2"
+
+
+def test_batch_does_not_retry_non_retryable_errors(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+    monkeypatch.setenv("CANCELLATION_DEADLINE_MINUTES", "525600")
+    monkeypatch.setattr(lambada_handler, "_BATCH_BASE_DELAY_SECONDS", 0)
+
+    sqs_mock = _mock_client()
+    sqs_mock.send_message_batch.side_effect = ClientError(
+        {"Error": {"Code": "AWS.SimpleQueueService.NonExistentQueue", "Message": "missing"}}, "SendMessageBatch"
+    )
+    dynamodb_mock = _mock_dynamodb_client()
+    dynamodb_mock.batch_write_item.side_effect = [
+        ClientError(
+            {"Error": {"Code": "InternalServerError"}, "ResponseMetadata": {"HTTPStatusCode": 500}},
+            "BatchWriteItem",
+        ),
+        ClientError({"Error": {"Code": "ValidationException", "Message": "bad"}}, "BatchWriteItem"),
+    ]
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ):
+        response = lambada_handler.handler({"Records": [_sqs_record("m1", _fresh_payload())]}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    sqs_mock.send_message_batch.assert_called_once()
+    assert dynamodb_mock.batch_write_item.call_count == 2
+
+
+def test_rejects_records_from_other_event_sources(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+
+    sqs_mock = _mock_client()
+    dynamodb_mock = _mock_dynamodb_client()
+    stream_record = {"eventSource": "aws:dynamodb", "eventName": "INSERT", "dynamodb": {"SequenceNumber": "1"}}
+
+    with patch("lambada_handler.sqs_client", return_value=sqs_mock), patch(
+        "lambada_handler.dynamodb_client", return_value=dynamodb_mock
+    ), pytest.raises(ValueError, match="aws:dynamodb"):
+        lambada_handler.handler({"Records": [_sqs_record("m1", _fresh_payload()), stream_record]}, None)
+
+    sqs_mock.send_message_batch.assert_not_called()
+    dynamodb_mock.batch_write_item.assert_not_called()
+
+
+def test_log_level_is_read_from_the_environment(monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    try:
+        importlib.reload(lambada_handler)
+        assert lambada_handler.logger.isEnabledFor(logging.DEBUG)
+    finally:
+        monkeypatch.delenv("LOG_LEVEL")
+        importlib.reload(lambada_handler)
+
+    assert not lambada_handler.logger.isEnabledFor(logging.DEBUG)
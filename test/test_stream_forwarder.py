@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+import stream_forwarder
+
+
+def _record(sequence, body, correlation_id="corr-1", event_name="INSERT", old_body=None):
+    record = {
+        "eventName": event_name,
+        "dynamodb": {
+            "SequenceNumber": sequence,
+            "NewImage": {
+                "messageBody": {"S": body},
+                "correlationId": {"S": correlation_id},
+            },
+        },
+    }
+    if old_body is not None:
+        record["dynamodb"]["OldImage"] = {"messageBody": {"S": old_body}}
+    return record
+
+
+def _set_env(monkeypatch):
+    monkeypatch.setenv("SQS_QUEUE_URL", "https://sqs.queue")
+    monkeypatch.setenv("DCE_TABLE_NAME", "dce-table")
+
+
+def test_forwards_new_messages_in_batches(monkeypatch):
+    _set_env(monkeypatch)
+    sqs_mock = MagicMock()
+    sqs_mock.send_message_batch.return_value = {"Successful": [], "Failed": []}
+    records = [_record(str(i), f'{{"id": "{i}"}}', correlation_id=f"corr-{i}") for i in range(12)]
+
+    with patch("stream_forwarder.sqs_client", return_value=sqs_mock):
+        response = stream_forwarder.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert sqs_mock.send_message_batch.call_count == 2
+    first_entries = sqs_mock.send_message_batch.call_args_list[0].kwargs["Entries"]
+    assert len(first_entries) == 10
+    assert first_entries[0]["MessageBody"] == '{"id": "0"}'
+    assert first_entries[0]["MessageAttributes"]["CorrelationId"]["StringValue"] == "corr-0"
+    assert len(sqs_mock.send_message_batch.call_args_list[1].kwargs["Entries"]) == 2
+
+
+def test_skips_removals_and_unchanged_messages(monkeypatch):
+    _set_env(monkeypatch)
+    sqs_mock = MagicMock()
+    records = [
+        _record("1", "same", event_name="MODIFY", old_body="same"),
+        {"eventName": "REMOVE", "dynamodb": {"SequenceNumber": "2"}},
+    ]
+
+    with patch("stream_forwarder.sqs_client", return_value=sqs_mock):
+        response = stream_forwarder.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    sqs_mock.send_message_batch.assert_not_called()
+
+
+def test_reports_failed_entries(monkeypatch):
+    _set_env(monkeypatch)
+    sqs_mock = MagicMock()
+    sqs_mock.send_message_batch.return_value = {"Failed": [{"Id": "1", "SenderFault": False}]}
+    records = [_record("10", "a"), _record("11", "b")]
+
+    with patch("stream_forwarder.sqs_client", return_value=sqs_mock):
+        response = stream_forwarder.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "11"}]}
+
+
+def test_reports_whole_batch_on_client_error(monkeypatch):
+    _set_env(monkeypatch)
+    sqs_mock = MagicMock()
+    sqs_mock.send_message_batch.side_effect = ClientError(
+        {"Error": {"Code": "500", "Message": "boom"}}, "SendMessageBatch"
+    )
+    records = [_record("10", "a"), _record("11", "b")]
+
+    with patch("stream_forwarder.sqs_client", return_value=sqs_mock):
+        response = stream_forwarder.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "10"}, {"itemIdentifier": "11"}]}